@@ -10,7 +10,8 @@ This code is designed to convert mass spectrometry data from a list of DataFrame
 Steps:
 ------
 1. **Input**:
-   - The script accepts a list of DataFrames (`dfs`), each containing mass spectrometry data with the following relevant columns:
+   - The script accepts a list of DataFrames (`dfs`), each containing mass spectrometry data with the following relevant columns
+     (a path to a CSV file can be given instead of a DataFrame; only these columns are then read from it):
      - `Compound`: The name of the compound.
      - `Peak Label`: A label indicating whether the entry is a main peak or a fragment peak (fragment peaks contain 'F' in the label).
      - `m/z (Expected)`: The expected m/z value of the peak.
@@ -22,12 +23,12 @@ Steps:
 
 2. **Processing**:
    - The script filters out rows where the `Peak Label` contains 'F' (indicating fragment peaks), and processes only the "main" entries.
-   - For each main entry, it extracts relevant information (e.g., compound name, precursor m/z, formula, retention time, etc.).
+   - The relevant information of the main entries (e.g., compound name, precursor m/z, formula, retention time, etc.) is extracted column by column.
    - The script checks if the retention time is available and non-zero, formatting it accordingly.
-   - For each compound, the script then finds its associated fragment peaks (rows where the `Peak Label` contains 'F') and collects their m/z values.
+   - The fragment peaks (rows where the `Peak Label` contains 'F') are grouped by compound once per DataFrame, and each compound looks up its m/z values from that grouping.
 
 3. **MSP Entry Construction**:
-   - For each compound, a properly formatted MSP entry is created, including the following details:
+   - The MSP entries of all compounds of a DataFrame are built at once by concatenating the formatted columns, each entry including the following details:
      - `NAME`: The name of the compound.
      - `PRECURSORMZ`: The precursor m/z value.
      - `PRECURSORTYPE`: The adduct type.
@@ -40,14 +41,14 @@ Steps:
      - The fragment peaks themselves, listed as m/z values with a placeholder intensity value of `999`.
 
 4. **Output**:
-   - The script writes all the generated MSP entries to a file named `HomeDB_MS2.msp`, which will be saved in the current directory.
+   - The script streams the generated MSP entries of each DataFrame to a file named `HomeDB_MS2.msp` (1 MB write buffer), which will be saved in the current directory.
 
 5. **Logging**:
    - A success message is printed once the data is successfully written to the MSP file.
 
 Input Requirements:
 -------------------
-- A list of DataFrames (`dfs`), where each DataFrame contains columns for compound data and peak information as described above.
+- A list of DataFrames (`dfs`) or CSV file paths, where each one contains columns for compound data and peak information as described above.
 
 Output:
 -------
@@ -57,6 +58,7 @@ Output:
 Code Modules and Libraries:
 ---------------------------
 - pandas: For handling DataFrame operations and extracting relevant compound information.
+- numpy: For formatting the fragment m/z values in bulk.
 - os: For file and directory management (optional depending on file saving logic).
 - re: For filtering and processing data based on regular expressions.
 - logging: For tracking and logging information about the data processing (if added).
@@ -69,50 +71,63 @@ Note:
 - This script assumes that the compound names in each DataFrame are unique, and the fragment peaks are correctly labeled with 'F' in the `Peak Label` column.
 """
 
-import pandas as pd
-
-dfs = ['liste of dfs'] # put your dfs for convert them to msp
-
-output_lines = []
-
-for df in dfs:
-    main_entries = df[~df['Peak Label'].str.contains('F', na=False)]
-
-    for _, main_row in main_entries.iterrows():
-        compound_name = main_row['Compound']
-        precursor_mz = main_row['m/z (Expected)']
-        formula = main_row['Formula']
-        retention_time = main_row['RT']
-        ion_mode = main_row['Charge']
-        compound_class = main_row['Family']
-        adduct = main_row['Adduct']
-
-        retention_time_str = f"RETENTIONTIME: {retention_time}" if pd.notna(retention_time) and retention_time != 0 else "RETENTIONTIME: "
-
-        num_peaks_rows = df[(df['Compound'] == compound_name) & (df['Peak Label'].str.contains('F', na=False))]
-
-        num_peaks = []
-        for _, peak_row in num_peaks_rows.iterrows():
-            num_peaks.append(f"{peak_row['m/z (Expected)']:.5f}\t999")
-        num_peaks_str = "\n".join(num_peaks)
-
-        entry = f"""NAME: {compound_name}
-PRECURSORMZ: {precursor_mz:.5f}
-PRECURSORTYPE: {adduct}
-SMILES: 
-INCHIKEY: 
-FORMULA: {formula}
-{retention_time_str}
-CCS: 
-IONMODE: {ion_mode}
-COMPOUNDCLASS: {compound_class}
-Comment: theoretical MS2 created from the information of Orbitrap Lipidomics.
-Num Peaks: {len(num_peaks)}
-{num_peaks_str}
-"""
-        output_lines.append(entry)
+from functools import reduce
+from operator import add
 
-with open("HomeDB_MS2.msp", "w") as f:
-    f.write("\n".join(output_lines))
+import numpy as np
+import pandas as pd
 
-print("Data successfully written to HomeDB_MS2.msp.")
+dfs = ['liste of dfs'] # put your dfs (or paths to CSV files) for convert them to msp
+
+# Only these columns are used to build the MSP entries
+msp_columns = ['Compound', 'Peak Label', 'm/z (Expected)', 'Formula', 'RT', 'Charge', 'Family', 'Adduct']
+
+def as_str(values):
+    """
+    Converts a column to an object array of Python strings, formatting each value as an f-string would.
+    Each string keeps its own length (a fixed-width numpy string array pads every value to the longest one).
+    """
+    return np.fromiter(map(str, values), dtype=object, count=len(values))
+
+with open("HomeDB_MS2.msp", "w", buffering=1 << 20) as f:
+    for df in dfs:
+        if isinstance(df, str):
+            df = pd.read_csv(df, usecols=msp_columns)
+
+        is_frag = df['Peak Label'].str.contains('F', regex=False, na=False).to_numpy()
+        main_entries = df[~is_frag]
+        frag_entries = df[is_frag]
+
+        # Fragment peaks of every compound: all peak lines formatted in one call, then joined per compound
+        frag_peaks = pd.Series(np.char.mod('%.5f\t999', frag_entries['m/z (Expected)'].to_numpy(dtype=float)), index=frag_entries.index)
+        frag_groups = frag_peaks.groupby(frag_entries['Compound'], sort=False)
+        frag_map = frag_groups.agg("\n".join)
+        frag_count = frag_groups.size()
+
+        compound_names = main_entries['Compound']
+        num_peaks_str = compound_names.map(frag_map).fillna("")
+        num_peaks = compound_names.map(frag_count).fillna(0).astype(int)
+
+        retention_time = main_entries['RT']
+        retention_time_str = np.where(
+            retention_time.notna() & (retention_time != 0),
+            "RETENTIONTIME: " + as_str(retention_time),
+            "RETENTIONTIME: "
+        )
+
+        # All MSP entries of the DataFrame are assembled column-wise, one concatenation per field
+        entry_parts = [
+            "NAME: ", as_str(compound_names),
+            "\nPRECURSORMZ: ", as_str(np.char.mod('%.5f', main_entries['m/z (Expected)'].to_numpy(dtype=float))),
+            "\nPRECURSORTYPE: ", as_str(main_entries['Adduct']),
+            "\nSMILES: \nINCHIKEY: \nFORMULA: ", as_str(main_entries['Formula']),
+            "\n", retention_time_str,
+            "\nCCS: \nIONMODE: ", as_str(main_entries['Charge']),
+            "\nCOMPOUNDCLASS: ", as_str(main_entries['Family']),
+            "\nComment: theoretical MS2 created from the information of Orbitrap Lipidomics.\nNum Peaks: ", as_str(num_peaks),
+            "\n", as_str(num_peaks_str), "\n\n",
+        ]
+        entries = reduce(add, entry_parts)
+        f.writelines(entries.tolist())
+
+print("Data successfully written to HomeDB_MS2.msp.")
\ No newline at end of file
@@ -11,7 +11,7 @@ calculations to determine the contributions of heavy isotopes to molecular mass
 
 Key features:
 1. **Input Parsing**: The script includes a function to parse molecular formulas (e.g., "C23H45NO4") into 
-   element counts.
+   C, H, N and O atom counts.
 2. **Isotopic Abundance Database**: The script uses a dictionary to store the natural isotopic abundances for 
    common elements (C, H, N, O).
 3. **M+1 Probability Calculation**: Computes the probability of having a single additional heavy isotope 
@@ -22,20 +22,25 @@ Key features:
    for multiple combinations of isotopes.
 6. **Flexible Input**: The code can be easily adapted to accept input formulas from a file, a user interface, 
    or a database table.
-7. **Output**: The probabilities of M+1, M+2, and M+3 peaks are printed for the given molecular formula.
+7. **Single Pass**: `calculate_m123` computes the three probabilities together, sharing the parsed formula and
+   the common isotope terms; the per-peak functions are kept as thin wrappers around it.
+   `compute_m123_batch` does the same for a whole column of formulas at once with numpy arrays.
+8. **Output**: The probabilities of M+1, M+2, and M+3 peaks are printed for the given molecular formula.
 
 Applications:
 - Useful in analytical chemistry, particularly for mass spectrometry and isotope pattern prediction.
 - Can be extended to support additional elements or isotopes as needed.
 
 Dependencies:
-- `pandas`: For handling data if extended for tabular input (not directly used in this script but easily adaptable).
-- `math`: For combinatorial calculations (e.g., `math.comb`) and mathematical operations.
+- `numba` (optional): Compiles the M+1/M+2/M+3 kernel of the batch calculation to native code (imported on first
+  use); the script runs without it.
+- `numpy`: For the vectorized batch calculation over many formulas.
+- `pandas`: For the tabular input and output of the batch calculation (imported only when it is used).
 """
 
-import pandas as pd
-from math import comb
-import math
+import numpy as np
+from functools import lru_cache
+import re
 
 isotopic_abundances = {
     'C': {'p': 1.07/100, 'n': 98.891/100},       # C-13 and C-12
@@ -44,53 +49,175 @@ isotopic_abundances = {
     'O': {'p1': 0.037/100, 'p2': 0.204/100, 'n': 99.759/100}  # O-17, O-18, and O-16
 }
 
+# Heavy isotope abundances and their powers, computed once for all formulas
+P_C13 = isotopic_abundances['C']['p']
+P_H2 = isotopic_abundances['H']['p']
+P_N15 = isotopic_abundances['N']['p']
+P_O17 = isotopic_abundances['O']['p1']
+P_O18 = isotopic_abundances['O']['p2']
+
+P_C13_2 = P_C13 * P_C13
+P_H2_2 = P_H2 * P_H2
+P_N15_2 = P_N15 * P_N15
+P_O17_2 = P_O17 * P_O17
+
+P_C13_3 = P_C13_2 * P_C13
+P_H2_3 = P_H2_2 * P_H2
+P_N15_3 = P_N15_2 * P_N15
+P_O17_3 = P_O17_2 * P_O17
+
+_FORMULA_RE = re.compile(r'([A-Z][a-z]*)(\d+)?')
+
+@lru_cache(maxsize=4096)
 def parse_formula(formula):
     """
-    Parses a molecular formula string into a dictionary of elements and their counts.
+    Parses a molecular formula string into its C, H, N and O atom counts.
+    Results are cached, so a formula shared by the M+1, M+2 and M+3 calculations is parsed once.
+    Other elements (e.g. P, S) do not contribute to the isotope calculations and are ignored.
+    An element written several times (e.g. "C2H5OH") has its counts summed.
 
     Args:
     formula (str): Molecular formula string .
 
     Returns:
-    dict: A dictionary with element symbols as keys and atom counts as values.
-          Example: "C6H12O6" -> {'C': 6, 'H': 12, 'O': 6}
+    tuple: The (C, H, N, O) atom counts.
+           Example: "C6H12O6" -> (6, 12, 0, 6)
+    """
+    C = H = N = O = 0
+    for match in _FORMULA_RE.finditer(formula):
+        elem, count = match.groups()
+        n = int(count) if count else 1
+        if elem == 'C':
+            C += n
+        elif elem == 'H':
+            H += n
+        elif elem == 'N':
+            N += n
+        elif elem == 'O':
+            O += n
+    return C, H, N, O
+
+def _m123_kernel(x, y, w, z):
+    """
+    Computes the M+1, M+2 and M+3 probabilities (in %) from the C, H, N and O atom counts.
+    Works on plain integers as well as on int64 arrays of counts (see `_batch_kernel`).
     """
-    import re
-    elements = re.findall(r'([A-Z][a-z]*)(\d*)', formula)
-    return {elem: int(count) if count else 1 for elem, count in elements}
 
-def calculate_m_plus_1_probability(formula):
+    # One heavy isotope of a given type (a count of 0 gives a term of 0, no guard needed)
+    xC = x * P_C13
+    yH = y * P_H2
+    wN = w * P_N15
+    zO17 = z * P_O17
+    zO18 = z * P_O18
+
+    # Combinations as closed-form polynomials: C(n, 2) = n(n-1)/2 and C(n, 3) = C(n, 2)(n-2)/3
+    Cx2 = x * (x - 1) // 2
+    Cy2 = y * (y - 1) // 2
+    Cw2 = w * (w - 1) // 2
+    Cz2 = z * (z - 1) // 2
+    Cx3 = Cx2 * (x - 2) // 3
+    Cy3 = Cy2 * (y - 2) // 3
+    Cw3 = Cw2 * (w - 2) // 3
+    Cz3 = Cz2 * (z - 2) // 3
+
+    # Two heavy isotopes of the same type
+    xC2 = Cx2 * P_C13_2
+    yH2 = Cy2 * P_H2_2
+    wN2 = Cw2 * P_N15_2
+    zO17_2 = Cz2 * P_O17_2
+
+    # M+1 cas: One isotope BUT NOT O18
+    P_M1 = xC + yH + wN + zO17
+
+    # M+2
+    P_M2 = (
+        xC2 + yH2 + wN2 + zO17_2 +                # Case 1: Two heavy isotopes of the same type
+        xC * yH + xC * wN + xC * zO17 +           # Case 2: One heavy isotope of one type and one of another
+        yH * wN + yH * zO17 + wN * zO17 +
+        zO18                                      # Case 3: One O-18 directly contributes to M+2
+    )
+
+    # M+3
+    P_M3 = (
+        Cx3 * P_C13_3 +                           # Case 1: Three of the same isotope
+        Cy3 * P_H2_3 +
+        Cw3 * P_N15_3 +
+        Cz3 * P_O17_3 +
+        xC2 * (yH + wN + zO17) +                  # Case 2: Two of one isotope and one of another
+        yH2 * (xC + wN + zO17) +
+        wN2 * (xC + yH + zO17) +
+        zO17_2 * (xC + yH + wN) +
+        xC * yH * wN + xC * yH * zO17 +           # Case 3: One of each of three different isotopes
+        xC * wN * zO17 + yH * wN * zO17 +
+        (xC + yH + wN) * zO18 +                   # Case 4: One O18 paired with one of another isotope
+        Cz2 * P_O17 * P_O18
+    )
+
+    return P_M1*100, P_M2*100, P_M3*100
+
+
+@lru_cache(maxsize=None)
+def _batch_kernel():
     """
-    Calculates the probability of M+1 isotopes for a given molecular formula.
+    Returns `_m123_kernel` compiled with numba for the batch calculation, or the plain-Python kernel when numba is
+    not installed. numba is imported and the kernel compiled on first use only, so the single-formula path
+    does not pay for it.
+    """
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional: without it the kernel runs with numpy on the arrays
+        return _m123_kernel
+    return njit(cache=True)(_m123_kernel)
+
+
+def calculate_m123(formula):
+    """
+    Calculates the probabilities of the M+1, M+2 and M+3 isotopes for a given molecular formula in one pass.
+    The formula is parsed once and the single- and double-isotope terms are computed once and shared
+    between the three probabilities.
 
     Args:
     formula (str): Molecular formula string.
 
     Returns:
-    float: Probability of the M+1 isotope.
+    tuple: Probabilities (in %) of the M+1, M+2 and M+3 isotopes.
     """
 
-    composition = parse_formula(formula)
+    x, y, w, z = parse_formula(formula)
+    return _m123_kernel(x, y, w, z)
 
-    x = composition.get('C', 0)
-    y = composition.get('H', 0)
-    w = composition.get('N', 0)
-    z = composition.get('O', 0)
 
-    P_C13 = isotopic_abundances['C']['p']
-    P_H2 = isotopic_abundances['H']['p']
-    P_N15 = isotopic_abundances['N']['p']
-    P_O17 = isotopic_abundances['O']['p1']
+def compute_m123_batch(formulas):
+    """
+    Calculates the probabilities of the M+1, M+2 and M+3 isotopes for a whole column of molecular formulas.
+    The element counts are stacked into int64 arrays and passed to the same kernel as `calculate_m123` in one call,
+    instead of calling `calculate_m123` row by row.
 
-    # cas: One isotope BUT NOT O18 
-    P_M1 = (
-        x * P_C13 +  # Contribution from one C-13
-        y * P_H2 +   # Contribution from one H-2
-        w * P_N15 +  # Contribution from one N-15
-        z * P_O17    # Contribution from one O-17
-    )
+    Args:
+    formulas (pd.Series): Molecular formula strings (e.g., the formula column of the DB table).
+
+    Returns:
+    pd.DataFrame: Columns 'M1', 'M2' and 'M3' with the probabilities (in %), indexed like `formulas`.
+    """
+    import pandas as pd  # only needed for the batch path, kept out of the script start-up
+
+    counts = np.array([parse_formula(formula) for formula in formulas], dtype=np.int64).reshape(-1, 4)
+    M1, M2, M3 = _batch_kernel()(*counts.T)
 
-    return P_M1*100
+    return pd.DataFrame({'M1': M1, 'M2': M2, 'M3': M3}, index=formulas.index)
+
+
+def calculate_m_plus_1_probability(formula):
+    """
+    Calculates the probability of M+1 isotopes for a given molecular formula.
+
+    Args:
+    formula (str): Molecular formula string.
+
+    Returns:
+    float: Probability of the M+1 isotope.
+    """
+    return calculate_m123(formula)[0]
 
 
 def calculate_m_plus_2_probability(formula):
@@ -103,51 +230,7 @@ def calculate_m_plus_2_probability(formula):
     Returns:
     float: Probability of the M+2 isotope.
     """
-
-    composition = parse_formula(formula)
-
-    x = composition.get('C', 0)
-    y = composition.get('H', 0)
-    w = composition.get('N', 0)
-    z = composition.get('O', 0)
-
-    P_C13 = isotopic_abundances['C']['p']
-    P_H2 = isotopic_abundances['H']['p']
-    P_N15 = isotopic_abundances['N']['p']
-    P_O17 = isotopic_abundances['O']['p1']
-    P_O18 = isotopic_abundances['O']['p2']
-
-    P_M2 = 0
-
-    # Case 1: Two heavy isotopes of the same type
-    if x >= 2:
-        P_M2 += math.comb(x, 2) * (P_C13**2)  # 2 x C-13
-    if y >= 2:
-        P_M2 += math.comb(y, 2) * (P_H2**2)   # 2 x H-2
-    if w >= 2:
-        P_M2 += math.comb(w, 2) * (P_N15**2)  # 2 x N-15
-    if z >= 2:
-        P_M2 += math.comb(z, 2) * (P_O17**2)  # 2 x O-17
-
-    # Case 2: One heavy isotope of one type and one of another
-    if x >= 1 and y >= 1:
-        P_M2 += x * P_C13 * y * P_H2
-    if x >= 1 and w >= 1:
-        P_M2 += x * P_C13 * w * P_N15
-    if x >= 1 and z >= 1:
-        P_M2 += x * P_C13 * z * P_O17
-    if y >= 1 and w >= 1:
-        P_M2 += y * P_H2 * w * P_N15
-    if y >= 1 and z >= 1:
-        P_M2 += y * P_H2 * z * P_O17
-    if w >= 1 and z >= 1:
-        P_M2 += w * P_N15 * z * P_O17
-
-    # Case 3: One O-18 directly contributes to M+2
-    if z >= 1:
-        P_M2 += z * P_O18
-
-    return P_M2*100
+    return calculate_m123(formula)[1]
 
 
 def calculate_m_plus_3_probability(formula):
@@ -160,86 +243,12 @@ def calculate_m_plus_3_probability(formula):
     Returns:
     float: Probability of the M+3 isotope.
     """
-    import math
-
-    composition = parse_formula(formula)
-
-    x = composition.get('C', 0)
-    y = composition.get('H', 0)
-    w = composition.get('N', 0)
-    z = composition.get('O', 0)
-
-    P_C13 = isotopic_abundances['C']['p']
-    P_H2 = isotopic_abundances['H']['p']
-    P_N15 = isotopic_abundances['N']['p']
-    P_O17 = isotopic_abundances['O']['p1']
-    P_O18 = isotopic_abundances['O']['p2']
-
-    P_M3 = 0
-
-    # Case 1: Three of the same isotope
-    if x >= 3:
-        P_M3 += math.comb(x, 3) * P_C13**3
-    if y >= 3:
-        P_M3 += math.comb(y, 3) * P_H2**3
-    if w >= 3:
-        P_M3 += math.comb(w, 3) * P_N15**3
-    if z >= 3:
-        P_M3 += math.comb(z, 3) * P_O17**3
-
-    # Case 2: Two of one isotope and one of another
-    if x >= 2 and y >= 1:
-        P_M3 += math.comb(x, 2) * P_C13**2 * y * P_H2
-    if x >= 2 and w >= 1:
-        P_M3 += math.comb(x, 2) * P_C13**2 * w * P_N15
-    if x >= 2 and z >= 1:
-        P_M3 += math.comb(x, 2) * P_C13**2 * z * P_O17
-    if y >= 2 and x >= 1:
-        P_M3 += math.comb(y, 2) * P_H2**2 * x * P_C13
-    if y >= 2 and w >= 1:
-        P_M3 += math.comb(y, 2) * P_H2**2 * w * P_N15
-    if y >= 2 and z >= 1:
-        P_M3 += math.comb(y, 2) * P_H2**2 * z * P_O17
-    if w >= 2 and x >= 1:
-        P_M3 += math.comb(w, 2) * P_N15**2 * x * P_C13
-    if w >= 2 and y >= 1:
-        P_M3 += math.comb(w, 2) * P_N15**2 * y * P_H2
-    if w >= 2 and z >= 1:
-        P_M3 += math.comb(w, 2) * P_N15**2 * z * P_O17
-    if z >= 2 and x >= 1:
-        P_M3 += math.comb(z, 2) * P_O17**2 * x * P_C13
-    if z >= 2 and y >= 1:
-        P_M3 += math.comb(z, 2) * P_O17**2 * y * P_H2
-    if z >= 2 and w >= 1:
-        P_M3 += math.comb(z, 2) * P_O17**2 * w * P_N15
-
-    # Case 3: One of each of three different isotopes
-    P_M3 += x * P_C13 * y * P_H2 * w * P_N15
-    P_M3 += x * P_C13 * y * P_H2 * z * P_O17
-    P_M3 += x * P_C13 * w * P_N15 * z * P_O17
-    P_M3 += y * P_H2 * w * P_N15 * z * P_O17
-
-    # Case 4: One O18 paired with one of another isotope
-    if x >= 1:
-        P_M3 += x * P_C13 * z * P_O18
-    if y >= 1:
-        P_M3 += y * P_H2 * z * P_O18
-    if w >= 1:
-        P_M3 += w * P_N15 * z * P_O18
-    if z >= 2:
-        P_M3 += math.comb(z, 2) * P_O17 * P_O18
-
-    return P_M3*100
+    return calculate_m123(formula)[2]
 
 
 # Execution
 formula = "C23H45NO4" 
-probability_m1 = calculate_m_plus_1_probability(formula)
+probability_m1, probability_m2, probability_m3 = calculate_m123(formula)
 print(f"The probability of M+1 for {formula} is: {probability_m1:.4f}")
-
-probability = calculate_m_plus_2_probability(formula)
-print(f"The probability of M+2 for {formula} is: {probability:.4f}")
-
-
-probability_m3 = calculate_m_plus_3_probability(formula)
-print(f"The probability of M+3 for {formula} is: {probability_m3:.4f}")
+print(f"The probability of M+2 for {formula} is: {probability_m2:.4f}")
+print(f"The probability of M+3 for {formula} is: {probability_m3:.4f}")
\ No newline at end of file
@@ -12,7 +12,7 @@ After reading and pre-rocessing and merging of the MSP files of interest :
 1. **Reading and Parsing the MSP File**:
    - The script reads an MSP file, which contains mass spectrometry data entries.
    - Each entry in the MSP file begins with a 'NAME' field, followed by key-value pairs, such as `PRECURSORMZ`, `PRECURSORTYPE`, etc.
-   - The data is normalized and split into individual compound entries for processing.
+   - The file is read line by line, each entry running from its `NAME` line to the next blank line.
    
 2. **Updating MSP Entries Based on Table Data**:
    - The table provided is expected to contain columns: `NAME`, `PRECURSORMZ`, `RETENTIONTIME`, `PRECURSORTYPE`, and `IONMODE`.
@@ -66,366 +66,231 @@ import numpy as np
 import re
 import os
 
+# MSP1 compound names to rename from 'Carnitine' to 'Car', compiled once for the table and the per-line parsing
+_CARNITINE_RE = re.compile(r'^Carnitine')
+
 homeDB_path = "PATH/FOR/YOUR/MSP1.msp"
 POS_msp = "PATH/FOR/YOUR/MSP2.msp"
 NEG_msp = "PATH/FOR/YOUR/MSP3.msp"
 
 ###Data reading
 
-#Read MSP2
-
-with open(homeDB_path, "r") as file:
-    homDB_text = file.read()
-
-normalized_text = re.sub(r'\s+', ' ', homDB_text)
-
-entries = normalized_text.split("NAME: ")[1:]  
-
-matches = []
-
-for entry in entries:
-    name_match = re.search(r"^(.+?)\s+PRECURSORMZ:", entry)
-    if name_match:
-        compound_name = name_match.group(1)
-    else:
-        compound_name = "N/A"
-
-    mz_match = re.search(r"PRECURSORMZ:\s*(\S+)", entry)
-    if mz_match:
-        precursor_mz = mz_match.group(1)
-    else:
-        precursor_mz = "N/A"
-
-    adduct_match = re.search(r"PRECURSORTYPE:\s*(\S+)", entry)
-    if adduct_match:
-        adduct = adduct_match.group(1)
-    else:
-        adduct = "N/A"
-
-    retention_match = re.search(r"RETENTIONTIME:\s*(\S+)", entry)
-    if retention_match:
-        retention_time = retention_match.group(1)
-    else:
-        retention_time = "N/A"
-
-    ionmode_match = re.search(r"IONMODE:\s*(\S+)", entry)
-    if ionmode_match:
-        ion_mode = ionmode_match.group(1)
-    else:
-        ion_mode = "N/A"
-
-    matches.append((compound_name, precursor_mz, adduct, retention_time, ion_mode))
-
-if matches:
-    homDB_data = pd.DataFrame(matches, columns=["NAME", "PRECURSORMZ", "PRECURSORTYPE",  "RETENTIONTIME", "IONMODE"])
-    print(homDB_data.head())
-else:
-    print("No matches found.")
-
-#Read MSP2
-
-with open(POS_msp, "r") as file:
-    POS_txt = file.read()
-
-normalized_text = re.sub(r'\s+', ' ', POS_txt)
-
-entries = normalized_text.split("NAME: ")[1:]  
-
-matches = []
-
-for entry in entries:
-    name_match = re.search(r"^(.+?)\s+PRECURSORMZ:", entry)
-    if name_match:
-        compound_name = name_match.group(1)
-    else:
-        compound_name = "N/A"
-
-    mz_match = re.search(r"PRECURSORMZ:\s*(\S+)", entry)
-    if mz_match:
-        precursor_mz = mz_match.group(1)
-    else:
-        precursor_mz = "N/A"
-
-    adduct_match = re.search(r"PRECURSORTYPE:\s*(\S+)", entry)
-    if adduct_match:
-        adduct = adduct_match.group(1)
-    else:
-        adduct = "N/A"
-
-    retention_match = re.search(r"RETENTIONTIME:\s*(\S+)", entry)
-    if retention_match:
-        retention_time = retention_match.group(1)
-    else:
-        retention_time = "N/A"
-
-    ionmode_match = re.search(r"IONMODE:\s*(\S+)", entry)
-    if ionmode_match:
-        ion_mode = ionmode_match.group(1)
+MSP_COLUMNS = ["NAME", "PRECURSORMZ", "PRECURSORTYPE", "RETENTIONTIME", "IONMODE"]
+
+# Header keys read by read_msp, as the raw bytes before the ':' of their line, mapped to their column
+_MSP_COLUMN_KEYS = {column.encode(): column for column in MSP_COLUMNS}
+
+def read_msp(path):
+    """
+    Reads an MSP file line by line and extracts the main fields of each entry.
+    An entry starts at its 'NAME:' line and ends at the next blank line; each 'KEY: value' line is
+    dispatched to its column with a single dict lookup. The file is read in binary mode and only the
+    values of the kept fields are decoded (peak lines never are).
+
+    Args:
+    - path (str): Path to the MSP file.
+
+    Returns:
+    - pd.DataFrame: One row per entry with columns NAME, PRECURSORMZ, PRECURSORTYPE, RETENTIONTIME and IONMODE.
+      Missing or empty fields are set to "N/A".
+    """
+    rows = []
+    record = None
+
+    with open(path, "rb", buffering=1 << 20) as file:
+        for line in file:
+            key, sep, value = line.partition(b':')
+            column = _MSP_COLUMN_KEYS.get(key) if sep else None
+            if column == "NAME":
+                record = dict.fromkeys(MSP_COLUMNS, "N/A")
+                record["NAME"] = value.strip().decode() or "N/A"
+                rows.append(record)
+            elif column and record is not None:
+                record[column] = value.strip().decode() or "N/A"
+            elif not line.strip():
+                record = None
+
+    data = pd.DataFrame(rows, columns=MSP_COLUMNS)
+
+    if len(data):
+        print(data.head())
     else:
-        ion_mode = "N/A"
-
-    matches.append((compound_name, precursor_mz, adduct, retention_time, ion_mode))
+        print("No matches found.")
+    return data
 
-if matches:
-    POS_data = pd.DataFrame(matches, columns=["NAME", "PRECURSORMZ", "PRECURSORTYPE", "RETENTIONTIME", "IONMODE"])
-    print(POS_data.head())
-else:
-    print("No matches found.")
+#Read MSP1, MSP2 and MSP3 with the same reader
+homDB_data, POS_data, NEG_data = map(read_msp, [homeDB_path, POS_msp, NEG_msp])
 
-#Read MSP3
-
-with open(NEG_msp, "r") as file:
-    NEG_txt = file.read()
-
-normalized_text = re.sub(r'\s+', ' ', NEG_txt)
-
-entries = normalized_text.split("NAME: ")[1:]  
-
-matches = []
-
-for entry in entries:
-    name_match = re.search(r"^(.+?)\s+PRECURSORMZ:", entry)
-    if name_match:
-        compound_name = name_match.group(1)
-    else:
-        compound_name = "N/A"
-
-    mz_match = re.search(r"PRECURSORMZ:\s*(\S+)", entry)
-    if mz_match:
-        precursor_mz = mz_match.group(1)
-    else:
-        precursor_mz = "N/A"
-
-    adduct_match = re.search(r"PRECURSORTYPE:\s*(\S+)", entry)
-    if adduct_match:
-        adduct = adduct_match.group(1)
-    else:
-        adduct = "N/A"
-
-    retention_match = re.search(r"RETENTIONTIME:\s*(\S+)", entry)
-    if retention_match:
-        retention_time = retention_match.group(1)
-    else:
-        retention_time = "N/A"
-
-    ionmode_match = re.search(r"IONMODE:\s*(\S+)", entry)
-    if ionmode_match:
-        ion_mode = ionmode_match.group(1)
-    else:
-        ion_mode = "N/A"
+### Pre-Processing
 
-    matches.append((compound_name, precursor_mz, adduct, retention_time, ion_mode))
+def preprocess_msp_data(data, rename_carnitine=False):
+    """
+    Normalizes, in place, the data read from an MSP file: compound names in lower case with runs of whitespace
+    collapsed to one space, PRECURSORTYPE kept only for '[M...' adducts and RETENTIONTIME converted to numbers. Each column is transformed in a single pass.
 
-if matches:
-    NEG_data = pd.DataFrame(matches, columns=["NAME", "PRECURSORMZ", "PRECURSORTYPE", "RETENTIONTIME", "IONMODE"])
-    print(NEG_data.head())
-else:
-    print("No matches found.")
+    Args:
+    - data (pd.DataFrame): Data returned by `read_msp`.
+    - rename_carnitine (bool): Rename names starting with 'Carnitine' to 'Car' before lowering them.
+    """
+    names = data['NAME']
+    if rename_carnitine:
+        names = names.str.replace(_CARNITINE_RE, 'Car', regex=True)
+    data['NAME'] = names.str.replace(r'\s+', ' ', regex=True).str.lower()
 
-### Pre-Processing
+    precursor_type = data['PRECURSORTYPE']
+    data['PRECURSORTYPE'] = precursor_type.where(precursor_type.str.startswith('[M'), np.nan)
+    data['RETENTIONTIME'] = pd.to_numeric(data['RETENTIONTIME'], errors='coerce')
 
 # For MSP1
 
-homDB_data['NAME'] = homDB_data['NAME'].str.replace(r'^Carnitine','Car', regex = True)
-homDB_data['PRECURSORTYPE'] = homDB_data['PRECURSORTYPE'].where(homDB_data['PRECURSORTYPE'].str.startswith('[M'), np.nan)
-homDB_data['RETENTIONTIME'] = pd.to_numeric(homDB_data['RETENTIONTIME'], errors='coerce')
-homDB_data['NAME'] = homDB_data['NAME'].str.lower()
+preprocess_msp_data(homDB_data, rename_carnitine=True)
 
-# For MSP2
+# For MSP2 and MSP3 ('CAR' names end up as 'car' with the lower case, no renaming needed)
 
-POS_data['NAME'] = POS_data['NAME'].str.replace(r'^CAR','Car', regex = True)
-POS_data['PRECURSORTYPE'] = POS_data['PRECURSORTYPE'].where(POS_data['PRECURSORTYPE'].str.startswith('[M'), np.nan)
-POS_data['RETENTIONTIME'] = pd.to_numeric(POS_data['RETENTIONTIME'], errors='coerce')
-POS_data['NAME'] = POS_data['NAME'].str.lower()
-
-# For MSP3
-
-NEG_data['NAME'] = NEG_data['NAME'].str.replace(r'^CAR','Car', regex = True)
-NEG_data['PRECURSORTYPE'] = NEG_data['PRECURSORTYPE'].where(NEG_data['PRECURSORTYPE'].str.startswith('[M'), np.nan)
-NEG_data['RETENTIONTIME'] = pd.to_numeric(NEG_data['RETENTIONTIME'], errors='coerce')
-NEG_data['NAME'] = NEG_data['NAME'].str.lower()
+preprocess_msp_data(POS_data)
+preprocess_msp_data(NEG_data)
 
 ### Merging
 
-# For MSP1 + MSP2
-#Priority for the MSP1
+# Priority MSP1 > MSP2 > MSP3, encoded by the concatenation order: the first row of each NAME is kept.
+# Names are normalized by preprocess_msp_data (lower case, whitespace runs collapsed, read stripped), so a compound
+# written with another capitalization or spacing in another file collapses onto the same row.
+# PRECURSORTYPE and RETENTIONTIME are only taken from MSP1, MSP2 and MSP3 complete PRECURSORMZ and IONMODE.
 
-merged_data = pd.merge(
-    POS_data, 
-    homDB_data, 
-    on='NAME', 
-    how='outer', 
-    suffixes=('_POS', '_HOM')
-)
-merged_data
+total_data = pd.concat(
+    [
+        homDB_data,
+        POS_data[['NAME', 'PRECURSORMZ', 'IONMODE']],
+        NEG_data[['NAME', 'PRECURSORMZ', 'IONMODE']],
+    ],
+    ignore_index=True
+).drop_duplicates(subset='NAME', keep='first', ignore_index=True)
 
-merged_data['PRECURSORMZ'] = merged_data['PRECURSORMZ_HOM'].where(merged_data['PRECURSORMZ_HOM'].notna(), merged_data['PRECURSORMZ_POS'])
+total_data = total_data[['NAME', 'PRECURSORMZ', 'RETENTIONTIME', 'PRECURSORTYPE','IONMODE']]
 
-merged_data['PRECURSORTYPE'] = merged_data['PRECURSORTYPE_HOM']
-merged_data['RETENTIONTIME'] = merged_data['RETENTIONTIME_HOM']
+### New MSP generating
 
-merged_data['IONMODE'] = merged_data['IONMODE_HOM'].where(merged_data['IONMODE_HOM'].notna(), merged_data['IONMODE_POS'])
+def _name_key(name):
+    """
+    Lookup key of a compound name, normalized like the MSP1 names in the Pre-Processing ('Car' prefix, single spaces,
+    lower case).
+    """
+    return ' '.join(_CARNITINE_RE.sub('Car', name).split()).lower()
+
+def _peak_count(value):
+    """Parses the 'Num Peaks' value of an entry, 0 when it is empty."""
+    return int(value) if value else 0
+
+# Header fields of an MSP entry, keyed by the text before the ':' of their line, with the parser of their value
+MSP_FIELD_PARSERS = {
+    'PRECURSORMZ': str,
+    'PRECURSORTYPE': str,
+    'RETENTIONTIME': str,
+    'SMILES': str,
+    'INCHIKEY': str,
+    'FORMULA': str,
+    'CCS': str,
+    'IONMODE': str,
+    'COMPOUNDCLASS': str,
+    'Comment': str,
+    'Num Peaks': _peak_count,
+}
 
-Home_POS_data = merged_data[['NAME', 'PRECURSORMZ', 'RETENTIONTIME', 'PRECURSORTYPE','IONMODE']]
+# Fields of an entry read from the MSP file, before its lines are parsed (copied per entry; PEAKS is added separately
+# since each entry needs its own list)
+_EMPTY_ENTRY = {
+    'PRECURSORMZ': None,
+    'PRECURSORTYPE': None,
+    'RETENTIONTIME': None,
+    'SMILES': None,
+    'INCHIKEY': None,
+    'FORMULA': None,
+    'CCS': None,
+    'IONMODE': None,
+    'COMPOUNDCLASS': None,
+    'Comment': None,
+    'Num Peaks': 0,
+}
 
-# For (MSP1 + MSP2) + MSP3
-#Priority for the (MSP1 + MSP2)
+# Fields of an entry only found in the table, before the table values are set
+_NEW_ENTRY = {
+    'SMILES': "",
+    'INCHIKEY': "",
+    'FORMULA': "",
+    'CCS': "",
+    'COMPOUNDCLASS': "",
+    'Comment': "",
+    'Num Peaks': 0,
+}
 
-merged_data = pd.merge(
-    NEG_data, 
-    Home_POS_data, 
-    on='NAME', 
-    how='outer', 
-    suffixes=('_NEG', '_HOM')
+# Header lines of an entry written by modify_txt_file, after its NAME line and before its peaks
+MSP_ENTRY_TEMPLATE = (
+    "PRECURSORMZ: {PRECURSORMZ}\n"
+    "PRECURSORTYPE: {PRECURSORTYPE}\n"
+    "SMILES: {SMILES}\n"
+    "INCHIKEY: {INCHIKEY}\n"
+    "FORMULA: {FORMULA}\n"
+    "RETENTIONTIME: {RETENTIONTIME}\n"
+    "CCS: {CCS}\n"
+    "IONMODE: {IONMODE}\n"
+    "COMPOUNDCLASS: {COMPOUNDCLASS}\n"
+    "Comment: {Comment}\n"
+    "Num Peaks: {Num Peaks}\n"
 )
-merged_data
-
-merged_data['PRECURSORMZ'] = merged_data['PRECURSORMZ_HOM'].where(merged_data['PRECURSORMZ_HOM'].notna(), merged_data['PRECURSORMZ_NEG'])
-
-merged_data['PRECURSORTYPE'] = merged_data['PRECURSORTYPE_HOM']
-merged_data['RETENTIONTIME'] = merged_data['RETENTIONTIME_HOM']
-
-merged_data['IONMODE'] = merged_data['IONMODE_HOM'].where(merged_data['IONMODE_HOM'].notna(), merged_data['IONMODE_NEG'])
-
-total_data = merged_data[['NAME', 'PRECURSORMZ', 'RETENTIONTIME', 'PRECURSORTYPE','IONMODE']]
-
-### New MSP generating
 
 def modify_txt_file(homDB_path, table_df):
 
-    with open(homDB_path, "r") as file:
-        homDB_text = file.read()
-
-    normalized_text = re.sub(r'\s+', ' ', homDB_text)
-    entries = normalized_text.split("NAME: ")[1:]  
-
     txt_data = {}
 
-    current_name = None
-    for entry in entries:
-        lines = entry.split("\n")
+    entry = None
+    peaks = None
+    with open(homDB_path, "r", buffering=1 << 20) as file:
+        for line in file:
+            # Peak lines ("m/z<TAB>intensity") make up most of the file: strip each line once and append
+            # to the current entry's list through a local reference
+            stripped = line.strip()
 
-        for line in lines:
             if line.startswith('NAME:'):
-                current_name = line.strip().split("NAME: ")[1]
-                txt_data[current_name] = {
-                    'PRECURSORMZ': None,
-                    'PRECURSORTYPE': None,
-                    'RETENTIONTIME': None,
-                    'SMILES': None,
-                    'INCHIKEY': None,
-                    'FORMULA': None,
-                    'CCS': None,
-                    'IONMODE': None,
-                    'COMPOUNDCLASS': None,
-                    'Comment': None,
-                    'Num Peaks': 0,
-                    'PEAKS': []
-                }
-
-            elif line.startswith('PRECURSORMZ:'):
-                if current_name:
-                    txt_data[current_name]['PRECURSORMZ'] = line.strip().split("PRECURSORMZ: ")[1]
-
-            elif line.startswith('PRECURSORTYPE:'):
-                if current_name:
-                    txt_data[current_name]['PRECURSORTYPE'] = line.strip().split("PRECURSORTYPE: ")[1]
-
-            elif line.startswith('RETENTIONTIME:'):
-                if current_name:
-                    txt_data[current_name]['RETENTIONTIME'] = line.strip().split("RETENTIONTIME: ")[1]
-
-            elif line.startswith('SMILES:'):
-                if current_name:
-                    smi = line.strip().split("SMILES: ")[1] if len(line.strip().split("SMILES: ")) > 1 else ""
-                    txt_data[current_name]['SMILES'] = smi
-
-            elif line.startswith('INCHIKEY:'):
-                if current_name:
-                    inchi = line.strip().split("INCHIKEY: ")[1] if len(line.strip().split("INCHIKEY: ")) > 1 else ""
-                    txt_data[current_name]['INCHIKEY'] = inchi
-
-            elif line.startswith('FORMULA:'):
-                if current_name:
-                    formula = line.strip().split("FORMULA: ")[1] if len(line.strip().split("FORMULA: ")) > 1 else ""
-                    txt_data[current_name]['FORMULA'] = formula
-
-            elif line.startswith('CCS:'):
-                if current_name:
-                    ccs = line.strip().split("CCS: ")[1] if len(line.strip().split("CCS: ")) > 1 else ""
-                    txt_data[current_name]['CCS'] = ccs
-
-            elif line.startswith('IONMODE:'):
-                if current_name:
-                    ion_mode = line.strip().split("IONMODE: ")[1] if len(line.strip().split("IONMODE: ")) > 1 else ""
-                    txt_data[current_name]['IONMODE'] = ion_mode
-
-            elif line.startswith('COMPOUNDCLASS:'):
-                if current_name:
-                    compound_class = line.strip().split("COMPOUNDCLASS: ")[1] if len(line.strip().split("COMPOUNDCLASS: ")) > 1 else ""
-                    txt_data[current_name]['COMPOUNDCLASS'] = compound_class
-
-            elif line.startswith('Comment:'):
-                if current_name:
-                    comment = line.strip().split("Comment: ")[1] if len(line.strip().split("Comment: ")) > 1 else ""
-                    txt_data[current_name]['Comment'] = comment
-
-            elif line.startswith('Num Peaks:'):
-                if current_name:
-                    num_peaks = int(line.strip().split("Num Peaks: ")[1]) if len(line.strip().split("Num Peaks: ")) > 1 else 0
-                    txt_data[current_name]['Num Peaks'] = num_peaks
-
-            if current_name and line.strip() and line.strip().count("\t") == 1:
-                txt_data[current_name]['PEAKS'].append(line.strip())
-
-    for idx, row in table_df.iterrows():
-        name_in_table = row['NAME']
-        if name_in_table in txt_data:
-            txt_data[name_in_table]['PRECURSORMZ'] = row['PRECURSORMZ']
-            txt_data[name_in_table]['RETENTIONTIME'] = row['RETENTIONTIME']
-            txt_data[name_in_table]['PRECURSORTYPE'] = row['PRECURSORTYPE']
-            txt_data[name_in_table]['IONMODE'] = row['IONMODE']
-        else:
-            txt_data[name_in_table] = {
-                'PRECURSORMZ': row['PRECURSORMZ'],
-                'RETENTIONTIME': row['RETENTIONTIME'],
-                'PRECURSORTYPE': row['PRECURSORTYPE'],
-                'IONMODE': row['IONMODE'],
-                'SMILES': "",
-                'INCHIKEY': "",
-                'FORMULA': "",
-                'CCS': "",
-                'COMPOUNDCLASS': "",
-                'Comment': "",
-                'Num Peaks': 0,
-                'PEAKS': []
-            }
-
-    updated_txt_lines = []
-    for name, data in txt_data.items():
-        updated_txt_lines.append(f"NAME: {name}")
-        updated_txt_lines.append(f"PRECURSORMZ: {data['PRECURSORMZ']}")
-        updated_txt_lines.append(f"PRECURSORTYPE: {data['PRECURSORTYPE']}")
-        updated_txt_lines.append(f"SMILES: {data['SMILES']}")
-        updated_txt_lines.append(f"INCHIKEY: {data['INCHIKEY']}")
-        updated_txt_lines.append(f"FORMULA: {data['FORMULA']}")
-        updated_txt_lines.append(f"RETENTIONTIME: {data['RETENTIONTIME']}")
-        updated_txt_lines.append(f"CCS: {data['CCS']}")
-        updated_txt_lines.append(f"IONMODE: {data['IONMODE']}")
-        updated_txt_lines.append(f"COMPOUNDCLASS: {data['COMPOUNDCLASS']}")
-        updated_txt_lines.append(f"Comment: {data['Comment']}")
-        updated_txt_lines.append(f"Num Peaks: {data['Num Peaks']}")
-
-        for peak in data['PEAKS']:
-            updated_txt_lines.append(peak)
-
-        updated_txt_lines.append("") 
+                # Read like read_msp ("N/A" when empty); the entry keeps its name as written in the file and is
+                # stored under its normalized key, so the table rows match their entries
+                name = stripped.partition(':')[2].strip() or "N/A"
+                entry = _EMPTY_ENTRY.copy()
+                entry['NAME'] = name
+                entry['PEAKS'] = peaks = []
+                txt_data[_name_key(name)] = entry
+
+            else:
+                key, sep, value = stripped.partition(':')
+                parse_field = MSP_FIELD_PARSERS.get(key) if sep else None
+                if parse_field and entry is not None:
+                    entry[key] = parse_field(value.strip())
+
+            if peaks is not None and stripped.count("\t") == 1:
+                peaks.append(stripped)
+
+    # Plain column arrays instead of one Series per row with iterrows
+    table_columns = [table_df[column].to_numpy() for column in ('NAME', 'PRECURSORMZ', 'RETENTIONTIME', 'PRECURSORTYPE', 'IONMODE')]
+    for name_in_table, precursor_mz, retention_time, precursor_type, ion_mode in zip(*table_columns):
+        key = _name_key(name_in_table)
+        entry = txt_data.get(key)
+        if entry is None:
+            entry = _NEW_ENTRY.copy()
+            entry['NAME'] = name_in_table
+            entry['PEAKS'] = []
+            txt_data[key] = entry
+        entry['PRECURSORMZ'] = precursor_mz
+        entry['RETENTIONTIME'] = retention_time
+        entry['PRECURSORTYPE'] = precursor_type
+        entry['IONMODE'] = ion_mode
 
     current_directory = os.getcwd()
     output_path = os.path.join(current_directory, "updated_homeDB.msp")
 
-    with open(output_path, 'w') as file:
-        file.writelines("\n".join(updated_txt_lines))
+    # Each entry is formatted in one call and written as soon as it is ready, through a 1 MB buffer
+    with open(output_path, 'w', buffering=1 << 20) as file:
+        for data in txt_data.values():
+            peaks = "".join(peak + "\n" for peak in data['PEAKS'])
+            file.write(f"NAME: {data['NAME']}\n{MSP_ENTRY_TEMPLATE.format_map(data)}{peaks}\n")
 
     print(f"File saved as: {output_path}")
 
@@ -1,44 +1,52 @@
+import importlib.util
 import os
-import random
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
+import numpy as np
 import pandas as pd
 import json
 
 def shuffle_table_with_new_index(data):
     """
-    Shuffle the table and add a new index while preserving the original sample column.
+    Shuffle the table rows with a random permutation while preserving the original sample column.
 
     Args:
-    - data (list of lists): The input data representing a table metabolite in columns.
+    - data (pandas.DataFrame): The input data representing a table metabolite in columns.
 
     Returns:
-    - list of tuples: Shuffled table with new index added.
-      Each tuple contains an index and a row of shuffled data.
+    - tuple: The shuffled table (pandas.DataFrame with a new 0..n-1 index) and the permutation used
+      (numpy array), where row i of the shuffled table is row perm[i] of the input table.
     """
-    indexed_data = list(enumerate(data))  # Keep original index with the data
-    random.shuffle(indexed_data)  # Shuffle the table
-    return indexed_data
+    perm = np.random.permutation(len(data))
+    return data.iloc[perm].reset_index(drop=True), perm
 
-def recover_original_order(shuffled_data, original_order):
+def recover_original_order(shuffled_data, perm):
     """
-    Recover the original order using the preserved original index.
+    Recover the original order using the permutation the table was shuffled with.
 
     Args:
-    - shuffled_data (list of tuples): Shuffled data where each tuple contains an index and a row of shuffled data.
-    - original_order (dict): Dictionary mapping original indices (as strings) to their respective rows.
+    - shuffled_data (pandas.DataFrame): Shuffled data, possibly with additional columns added after the shuffle.
+    - perm (array-like of int): Permutation returned by shuffle_table_with_new_index.
 
     Returns:
-    - list of lists: Recovered table in the original order.
+    - pandas.DataFrame: Recovered table in the original order, additional columns included.
     """
-    recovered_table = []
-    for shuffled_row in shuffled_data:
-        original_index = shuffled_row[0]  # Get the original index from the first element
-        original_row = original_order[str(original_index)]  # Get original row from original_order dict
-        additional_columns = shuffled_row[1][len(original_row):]  # Get any additional columns that were added
-        recovered_table.append(original_row + additional_columns)  # Combine original row with additional columns
+    return shuffled_data.iloc[np.argsort(perm)].reset_index(drop=True)
 
-    return recovered_table
+def read_sheet(file_path, sheet_name):
+    """
+    Load a sheet of an Excel file, with the fast Rust-based calamine engine when python-calamine is installed.
+
+    Args:
+    - file_path (str): Path of the Excel file.
+    - sheet_name (str): Name of the sheet to load.
+
+    Returns:
+    - pandas.DataFrame: The sheet data.
+    """
+    if importlib.util.find_spec("python_calamine"):
+        return pd.read_excel(file_path, sheet_name=sheet_name, engine="calamine")
+    return pd.read_excel(file_path, sheet_name=sheet_name)
 
 def gui_interaction():
     """
@@ -70,20 +78,14 @@ def gui_interaction():
             return
 
         # Load data from Excel file
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-
-        # Convert dataframe to list of lists (assuming your data is in this format)
-        table = df.values.tolist()
+        df = read_sheet(file_path, sheet_name)
 
         # Option selection dialog
         choice = messagebox.askquestion("Option", "Do you want to shuffle or recover the table?\n\nSelect 'Yes' for shuffle and 'No' for recover.", icon='question')
 
         if choice == 'yes':
             # Shuffle the table with new index
-            shuffled_table_with_index = shuffle_table_with_new_index(table)
-
-            # Extract the shuffled table without original index
-            shuffled_table = [row for _, row in shuffled_table_with_index]
+            shuffled_df, perm = shuffle_table_with_new_index(df)
 
             # Save shuffled table as a new Excel file
             save_path = os.path.dirname(file_path)
@@ -92,28 +94,18 @@ def gui_interaction():
             shuffled_file_path = os.path.join(save_path, shuffled_filename)
 
             # Add new order column (1, 2, 3, ...)
-            for idx, row in enumerate(shuffled_table):
-                row.insert(0, idx + 1)  # Insert new order at the beginning of each row
-
-            # Create new DataFrame for shuffled table
-            shuffled_df = pd.DataFrame(shuffled_table, columns=["Order"] + df.columns.tolist())
+            shuffled_df.insert(0, "Order", np.arange(1, len(shuffled_df) + 1))
             shuffled_df.to_excel(shuffled_file_path, index=False)  # Save shuffled DataFrame to Excel
 
-            # Save original order indices to a JSON file
+            # Save the permutation (original index of each shuffled row) to a JSON file
             json_filename = f"original_order-{original_filename}.json"
             json_file_path = os.path.join(save_path, json_filename)
 
-            original_order = {str(i): row for i, row in enumerate(table)}
             with open(json_file_path, 'w') as f:
-                json.dump(original_order, f, indent=4)
+                json.dump({"perm": perm.tolist()}, f)
 
             messagebox.showinfo("Success", f"Shuffled data saved as '{shuffled_filename}' and original order indices saved as '{json_filename}' in the same directory.")
 
-            # Print the shuffled table with new index and original sample order
-            print("\nShuffled Table with New Index (Original Sample Order):")
-            for row in shuffled_table:
-                print(row)
-
         elif choice == 'no':
             # Ask user for JSON file path for recovery
             json_path = filedialog.askopenfilename(title="Select JSON File", filetypes=[("JSON files", "*.json")])
@@ -122,13 +114,20 @@ def gui_interaction():
                 messagebox.showerror("Error", "No JSON file selected. Please select a JSON file.")
                 return
 
-            # Load original order indices from JSON
+            # Load the permutation from JSON
             with open(json_path, 'r') as f:
-                original_order = json.load(f)
+                perm = json.load(f).get("perm")
+
+            if perm is None:
+                messagebox.showerror("Error", "The JSON file does not contain a shuffle permutation. Please select the original order JSON file of this table.")
+                return
 
-            # Recover the original order using the preserved original index
-            shuffled_data = [(i, row) for i, row in enumerate(table)]  # Add original indices to the current data
-            recovered_table = recover_original_order(shuffled_data, original_order)
+            if len(perm) != len(df):
+                messagebox.showerror("Error", f"The JSON file holds the order of {len(perm)} rows but the sheet has {len(df)} rows.")
+                return
+
+            # Recover the original order; the shuffle "Order" column is replaced by a new one below
+            recovered_df = recover_original_order(df.drop(columns="Order", errors="ignore"), perm)
 
             # Save recovered table as a new Excel file
             save_path = os.path.dirname(file_path)
@@ -137,20 +136,11 @@ def gui_interaction():
             recovered_file_path = os.path.join(save_path, recovered_filename)
 
             # Add new order column (1, 2, 3, ...)
-            for idx, row in enumerate(recovered_table):
-                row.insert(0, idx + 1)  # Insert new order at the beginning of each row
-
-            # Create new DataFrame for recovered table
-            recovered_df = pd.DataFrame(recovered_table, columns=["Order"] + df.columns.tolist())
+            recovered_df.insert(0, "Order", np.arange(1, len(recovered_df) + 1))
             recovered_df.to_excel(recovered_file_path, index=False)  # Save recovered DataFrame to Excel
 
             messagebox.showinfo("Success", f"Recovered data saved as '{recovered_filename}' in the same directory.")
 
-            # Print the recovered table with new order
-            print("\nRecovered Table (Original Order with New Index):")
-            for row in recovered_table:
-                print(row)
-
         else:
             messagebox.showinfo("Info", "No action selected. Exiting.")
 